@@ -1,8 +1,19 @@
 import tkinter as tk          # GUI
+from tkinter import ttk       # Styled widgets (fonts resolved once per style)
+import tkinter.font as tkfont # Named fonts shared by every widget
+import hashlib                # Derive per-player RNG seeds
 import json                   # Load Connections data
 import random                 # Shuffle groups/tiles
+import sys
+from enum import IntEnum
+from functools import partial
 from pathlib import Path      # Safer filesystem paths
+import math
 import os
+import queue                  # Hand-off of LSL markers to the push thread
+import threading
+import time                   # Monotonic deadlines for countdowns
+import weakref
 
 # ---------------------------------------------------------
 # Optional: set LSL environment variables (if using later)
@@ -16,6 +27,12 @@ try:
 except ImportError:
     pylsl = None
 
+# Optional: C-accelerated JSON parsing for the puzzle file (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # ======================================================================
 # 🎯 GLOBAL VISUAL CONSTANTS (AESTHETIC TUNING)
@@ -36,6 +53,41 @@ FONT_RAT_ENTRY    = ("Arial", 18)
 FONT_RAT_FEEDBACK = ("Arial", 16)
 FONT_RAT_ANSWER   = ("Arial", 26, "bold")  # answer is slightly larger + bold
 
+# Button / entry fonts
+FONT_ENTRY       = ("Arial", 18)
+FONT_BUTTON      = ("Arial", 16)
+FONT_BUTTON_BOLD = ("Arial", 16, "bold")
+FONT_BUTTON_SM   = ("Arial", 14)
+
+# Pre-resolved named fonts (tkfont.Font), built by init_fonts() once a Tk root
+# exists. Widgets take these instead of the tuples above so Tk shares one font
+# handle rather than parsing the descriptor and resolving metrics per widget.
+FONT_TITLE_F = FONT_SUBTITLE_F = FONT_TILE_F = FONT_STATUS_F = FONT_LABEL_F = None
+FONT_RAT_PROMPT_F = FONT_RAT_TIMER_F = FONT_RAT_FEEDBACK_F = FONT_RAT_ANSWER_F = None
+FONT_ENTRY_F = FONT_BUTTON_F = FONT_BUTTON_BOLD_F = FONT_BUTTON_SM_F = None
+
+
+def init_fonts(root):
+    """Create the module-level FONT_*_F named fonts for `root` (idempotent)."""
+    global FONT_TITLE_F, FONT_SUBTITLE_F, FONT_TILE_F, FONT_STATUS_F, FONT_LABEL_F
+    global FONT_RAT_PROMPT_F, FONT_RAT_TIMER_F, FONT_RAT_FEEDBACK_F, FONT_RAT_ANSWER_F
+    global FONT_ENTRY_F, FONT_BUTTON_F, FONT_BUTTON_BOLD_F, FONT_BUTTON_SM_F
+    if FONT_TITLE_F is not None:
+        return
+    FONT_TITLE_F = tkfont.Font(root=root, font=FONT_TITLE)
+    FONT_SUBTITLE_F = tkfont.Font(root=root, font=FONT_SUBTITLE)
+    FONT_TILE_F = tkfont.Font(root=root, font=FONT_TILE)
+    FONT_STATUS_F = tkfont.Font(root=root, font=FONT_STATUS)
+    FONT_LABEL_F = tkfont.Font(root=root, font=FONT_LABEL)
+    FONT_RAT_PROMPT_F = tkfont.Font(root=root, font=FONT_RAT_PROMPT)
+    FONT_RAT_TIMER_F = tkfont.Font(root=root, font=FONT_RAT_TIMER)
+    FONT_RAT_FEEDBACK_F = tkfont.Font(root=root, font=FONT_RAT_FEEDBACK)
+    FONT_RAT_ANSWER_F = tkfont.Font(root=root, font=FONT_RAT_ANSWER)
+    FONT_ENTRY_F = tkfont.Font(root=root, font=FONT_ENTRY)
+    FONT_BUTTON_F = tkfont.Font(root=root, font=FONT_BUTTON)
+    FONT_BUTTON_BOLD_F = tkfont.Font(root=root, font=FONT_BUTTON_BOLD)
+    FONT_BUTTON_SM_F = tkfont.Font(root=root, font=FONT_BUTTON_SM)
+
 
 # ======================================================================
 # 📂 LOAD CONNECTIONS PUZZLE DATA (LEVEL 2)
@@ -48,8 +100,34 @@ if not level2_json_path.exists():
         f"{level2_json_path} not found. Please run the filter script first."
     )
 
-with open(level2_json_path, "r", encoding="utf-8") as f:
-    all_groups = json.load(f)  # list of dicts: {"group": "...", "members": ["...", "...", "...", "..."]}
+# Parsed lazily on the first Connections puzzle (see get_all_groups), not at import.
+_all_groups = None  # list of dicts: {"group": "...", "members": ["...", "...", "...", "..."]}
+
+# Flat read-only views built alongside _all_groups; puzzles sample group indices into these
+_GROUP_IDS = None
+_GROUP_MEMBERS = None
+_GROUP_INDICES = None
+_GROUP_CANON = None  # group index -> index of the first group with the same label
+
+
+def _canonical_group_ids(labels):
+    """Map each group to the first index carrying its label (several groups share a label)."""
+    first = {}
+    return [first.setdefault(label, i) for i, label in enumerate(labels)]
+
+
+def get_all_groups():
+    """Load the Connections groups on first call (orjson if available) and build the flat views."""
+    global _all_groups, _GROUP_IDS, _GROUP_MEMBERS, _GROUP_INDICES, _GROUP_CANON
+    if _all_groups is None:
+        data = level2_json_path.read_bytes()
+        groups = orjson.loads(data) if orjson is not None else json.loads(data)
+        _GROUP_IDS = [g["group"] for g in groups]
+        _GROUP_MEMBERS = [tuple(g["members"]) for g in groups]
+        _GROUP_INDICES = list(range(len(groups)))
+        _GROUP_CANON = _canonical_group_ids(_GROUP_IDS)
+        _all_groups = groups
+    return _all_groups
 
 
 # ======================================================================
@@ -80,6 +158,39 @@ RAT_ANSWERS = [
     "sore",
 ]
 
+# Display strings derived once from the static RAT data (indexed by item)
+RAT_ITEM_HEADERS = tuple(f"RAT Item {i + 1} of {len(RAT_PROMPTS)}" for i in range(len(RAT_PROMPTS)))
+# Countdown display loop run entirely inside Tcl (Python is only entered at phase boundaries).
+# rat_countdown_start writes `fmt` (with the whole seconds left) into the global Tcl variable
+# `var` every ~200 ms (±30 ms jitter) until `seconds` have elapsed; the pending after id lives
+# in ::rat_countdown_id so rat_countdown_cancel can stop it. Display only: the Python-side
+# phase-end after() decides when a phase actually ends.
+RAT_COUNTDOWN_TCL = r"""
+proc rat_countdown {var fmt deadline} {
+    upvar #0 $var v
+    set rem [expr {max(0, ($deadline - [clock milliseconds] + 999) / 1000)}]
+    set text [format $fmt $rem]
+    if {$v ne $text} { set v $text }
+    if {$rem > 0} {
+        set ::rat_countdown_id [after [expr {170 + int(rand() * 61)}] [list rat_countdown $var $fmt $deadline]]
+    } else {
+        unset -nocomplain ::rat_countdown_id
+    }
+}
+proc rat_countdown_start {var fmt seconds} {
+    rat_countdown_cancel
+    rat_countdown $var $fmt [expr {[clock milliseconds] + $seconds * 1000}]
+}
+proc rat_countdown_cancel {} {
+    if {[info exists ::rat_countdown_id]} {
+        after cancel $::rat_countdown_id
+        unset ::rat_countdown_id
+    }
+}
+"""
+
+RAT_REVEAL_TEXT = tuple(f"Answer: {a.upper()}" for a in RAT_ANSWERS)
+
 
 # ======================================================================
 # 🧭 EXPERIMENT APP (ORCHESTRATES ALL SCREENS)
@@ -105,6 +216,21 @@ class ExperimentApp:
         self.root = root
         self.root.geometry(WINDOW_SIZE)
         self.root.title(APP_TITLE)
+        init_fonts(root)
+
+        # ttk styles: Tk resolves each font once at style registration, not per widget
+        self.style = ttk.Style(root)
+        self.style.configure("Title.TLabel", font=FONT_TITLE_F)
+        self.style.configure("Subtitle.TLabel", font=FONT_SUBTITLE_F, wraplength=700)
+        self.style.configure("Rating.TButton", font=FONT_BUTTON_BOLD_F)
+        # Chosen rating = disabled + pressed: sunken with its own color. The stock themes only
+        # sink {!disabled pressed}, and map entries match first-wins, so the combined state
+        # has to be listed before plain "disabled".
+        self.style.map(
+            "Rating.TButton",
+            relief=[("disabled", "pressed", "sunken")],
+            background=[("disabled", "pressed", "#8fb8e8"), ("disabled", "#cccccc")],
+        )
 
         # LSL outlet (if pylsl available)
         self.outlet = None
@@ -123,8 +249,20 @@ class ExperimentApp:
                 print("WARNING: Could not initialize LSL outlet:", e)
                 self.outlet = None
 
-        # Player ID (captured on first screen)
+        # LSL pushes run on a background thread; the GUI thread only enqueues (timestamp, msg)
+        self._marker_q = queue.SimpleQueue()
+        self._marker_thread = None
+        if self.outlet is not None:
+            self._marker_thread = threading.Thread(target=self._marker_worker, name="lsl-markers", daemon=True)
+            self._marker_thread.start()
+        self.root.protocol("WM_DELETE_WINDOW", self._exit)  # drain pending markers on window close
+
+        # Player ID (captured on first screen) and the marker prefix derived from it
         self.player_id = None
+        self._marker_prefix = "PlayerNA_"
+
+        # Experiment RNG; reseeded from the Player ID so each subject's puzzle order is reproducible
+        self.rng = random.Random(0)
 
         # Main container; all screens render inside this frame
         self.main_frame = tk.Frame(root)
@@ -133,11 +271,18 @@ class ExperimentApp:
         # Track how many Connections puzzles have been completed in this session
         self.connections_puzzles_completed = 0  # ⭐ 15-puzzle cycle
 
+        # Single ConnectionsGame reused for every puzzle (created on stage start)
+        self.conn = None
+
         # Store per-puzzle spontaneity ratings (1..5 or None if skipped/no response)
         self.connections_spontaneity = []
 
-        # Remember last navigation callback (so '.' can advance intro/instructions screens etc.)
-        self._last_on_next = None
+        # What '.' does on the current screen (callable: () -> None); set on every transition
+        self._skip_target = None
+
+        # Reusable screen frames keyed by screen type ("message", "player_id", "rest", "connections").
+        # Built on first use, then hidden/shown instead of destroyed/recreated.
+        self._screen_cache = {}
 
         # Bind master skip '.' globally (works everywhere)
         self.root.bind("<KeyPress-period>", self._master_skip)
@@ -145,6 +290,7 @@ class ExperimentApp:
         # ---------- Connections REST state/timer members ----------
         self._conn_rest_active = False            # True while the rest UI is on screen
         self._conn_rest_remaining = 0
+        self._conn_rest_deadline = 0.0           # time.monotonic() at which the rest ends
         self._conn_rest_after_id = None          # after() handle for countdown ticks
         self._conn_rest_frame = None
         self._conn_rest_label = None
@@ -158,21 +304,85 @@ class ExperimentApp:
 
     # ---------- LSL: unified marker sender ----------
     def send_marker(self, label):
-        """Prefix every marker with Player ID and push via LSL if available."""
-        pid = self.player_id if self.player_id not in (None, "") else "NA"
-        msg = f"Player{pid}_{label}"
+        """
+        Prefix every marker with Player ID and queue it for LSL if available.
+        The LSL timestamp is captured here (GUI thread) so event ordering/timing is preserved;
+        the actual push happens on the marker thread.
+        """
+        msg = self._marker_prefix + label
         if self.outlet is not None:
-            try:
-                self.outlet.push_sample([msg])
-            except Exception as e:
-                print("LSL push_sample failed:", e)
+            self._marker_q.put((pylsl.local_clock(), msg))
         # Also print to console for debugging/trace
         print("[MARKER]", msg)
 
+    def send_markers(self, labels):
+        """Send several markers back to back; they share one timestamp and reach LSL in one push_chunk."""
+        prefix = self._marker_prefix
+        msgs = [prefix + label for label in labels]
+        if self.outlet is not None:
+            ts = pylsl.local_clock()
+            self._marker_q.put([(ts, msg) for msg in msgs])  # one queue item → one push_chunk
+        for msg in msgs:
+            print("[MARKER]", msg)
+
+    def _marker_worker(self):
+        """
+        Marker thread: push queued markers, batching whatever is already waiting into one push_chunk.
+        Queue items are a (timestamp, msg) pair, a list of such pairs (send_markers), or None to stop.
+        """
+        q = self._marker_q
+        chunked = True  # per-sample timestamps in push_chunk need pylsl >= 1.16
+        done = False
+        while not done:
+            item = q.get()
+            if item is None:
+                return
+            batch = []
+            while item is not None:
+                if isinstance(item, list):
+                    batch.extend(item)
+                else:
+                    batch.append(item)
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+            else:
+                done = True  # got the stop sentinel: push what we have, then stop
+            if chunked:
+                try:
+                    self.outlet.push_chunk([[m] for _, m in batch], timestamp=[t for t, _ in batch])
+                    continue
+                except Exception as e:
+                    # Older pylsl: fall back to push_sample for this and every later batch
+                    print("LSL push_chunk failed, falling back to push_sample:", e)
+                    chunked = False
+            for t, m in batch:
+                try:
+                    self.outlet.push_sample([m], t)
+                except Exception as e:
+                    print("LSL push_sample failed:", e)
+
+    def _exit(self):
+        """Let the marker thread drain any pending markers, then close the window."""
+        if self._marker_thread is not None:
+            self._marker_q.put(None)
+            self._marker_thread.join(timeout=1.0)
+            self._marker_thread = None
+        self.root.destroy()
+
     # ---------- Utility to clear the current screen ----------
     def clear_screen(self):
+        """Hide cached screen frames; destroy anything else (one-shot widgets)."""
+        self._skip_target = None  # the next screen installs its own '.' handler
+        cached = set(self._screen_cache.values())
         for w in self.main_frame.winfo_children():
-            w.destroy()
+            if w not in cached:
+                w.destroy()
+            elif w.winfo_manager() == "pack":
+                w.pack_forget()
+            else:
+                w.place_forget()
 
     # ---------- Safe widget config (prevents invalid-command errors) ----------
     @staticmethod
@@ -186,53 +396,74 @@ class ExperimentApp:
             pass
 
     # ---------- Centered title/subtitle screen helper ----------
+    def _message_screen(self):
+        """Build the shared title/subtitle/next-label frame once; later calls reuse it."""
+        frame = self._screen_cache.get("message")
+        if frame is None:
+            frame = tk.Frame(self.main_frame)
+            self._msg_title_lbl = ttk.Label(frame, style="Title.TLabel", justify="center")
+            self._msg_title_lbl.pack(pady=20)
+            self._msg_subtitle_lbl = ttk.Label(frame, style="Subtitle.TLabel", justify="center")
+            self._msg_subtitle_lbl.pack(pady=20)
+            self._msg_next_lbl = tk.Label(frame, font=FONT_LABEL_F)  # packed only when a next_label is given
+            self._screen_cache["message"] = frame
+        return frame
+
     def center_message_screen(self, title, subtitle, on_next, next_label="Press Enter/Return to continue."):
         """
         Draw a centered message with a big title and a wrapped subtitle.
         Binds Enter/Return to on_next so participants can proceed with the keyboard.
 
-        Also stores on_next so the master skip '.' can invoke it.
+        Also installs on_next as the master skip '.' target.
         """
         self.clear_screen()
 
-        frame = tk.Frame(self.main_frame)
-        frame.place(relx=0.5, rely=0.5, anchor="center")
-
-        tk.Label(frame, text=title, font=FONT_TITLE, justify="center").pack(pady=20)
-        tk.Label(frame, text=subtitle, font=FONT_SUBTITLE, wraplength=700, justify="center").pack(pady=20)
+        frame = self._message_screen()
+        self._msg_title_lbl.configure(text=title)
+        self._msg_subtitle_lbl.configure(text=subtitle)
         if next_label:
-            tk.Label(frame, text=next_label, font=FONT_LABEL).pack(pady=8)
+            self._msg_next_lbl.configure(text=next_label)
+            self._msg_next_lbl.pack(pady=8)
+        else:
+            self._msg_next_lbl.pack_forget()
+        frame.place(relx=0.5, rely=0.5, anchor="center")
 
         # Rebind Enter to advance to the next screen
-        self._last_on_next = on_next
+        self._skip_target = on_next
         self.root.bind("<Return>", lambda e: on_next())
 
     # ---------- Player ID screen ----------
     def show_player_id_screen(self):
         self.clear_screen()
-        frame = tk.Frame(self.main_frame)
-        frame.place(relx=0.5, rely=0.5, anchor="center")
+        frame = self._screen_cache.get("player_id")
+        if frame is None:
+            frame = tk.Frame(self.main_frame)
+            ttk.Label(frame, text="ENTER PLAYER ID", style="Title.TLabel").pack(pady=20)
+            ttk.Label(frame, text="Please enter your Participant/Player ID and press Enter.", style="Subtitle.TLabel").pack(pady=10)
 
-        tk.Label(frame, text="ENTER PLAYER ID", font=FONT_TITLE).pack(pady=20)
-        tk.Label(frame, text="Please enter your Participant/Player ID and press Enter.", font=FONT_SUBTITLE, wraplength=700).pack(pady=10)
+            self._player_id_entry = tk.Entry(frame, font=FONT_ENTRY_F)
+            self._player_id_entry.pack(pady=12)
 
-        entry = tk.Entry(frame, font=("Arial", 18))
-        entry.pack(pady=12)
-        entry.focus_set()
+            submit_btn = tk.Button(frame, text="Continue", font=FONT_BUTTON_F, command=self._submit_player_id)
+            submit_btn.pack(pady=10)
+            self._screen_cache["player_id"] = frame
 
-        def submit():
-            pid = entry.get().strip()
-            if pid == "":
-                return
-            self.player_id = pid
-            self.send_marker("Session_Start")  # optional session start
-            self.show_intro()
+        frame.place(relx=0.5, rely=0.5, anchor="center")
+        self._player_id_entry.delete(0, "end")
+        self._player_id_entry.focus_set()
 
-        submit_btn = tk.Button(frame, text="Continue", font=("Arial", 16), command=submit)
-        submit_btn.pack(pady=10)
+        self._skip_target = self._submit_player_id
+        self.root.bind("<Return>", lambda e: self._submit_player_id())
 
-        self._last_on_next = submit
-        self.root.bind("<Return>", lambda e: submit())
+    def _submit_player_id(self):
+        pid = self._player_id_entry.get().strip()
+        if pid == "":
+            return
+        self.player_id = pid
+        self._marker_prefix = f"Player{pid}_"
+        self.rng.seed(int.from_bytes(hashlib.blake2s(pid.encode("utf-8")).digest()[:8], "little"))
+        self.send_marker("Session_Start")  # optional session start
+        self.show_intro()
 
     # ---------- Screens ----------
     def show_intro(self):
@@ -292,7 +523,7 @@ class ExperimentApp:
         self.center_message_screen(
             "THANK YOU!",
             "You’ve completed everything. You may now close the window.",
-            lambda: self.root.destroy(),
+            self._exit,
             next_label="Press Enter/Return to exit."
         )
 
@@ -301,17 +532,22 @@ class ExperimentApp:
         """Begin the 10-puzzle Connections stage (with 15s REST + spontaneity rating between puzzles)."""
         self.clear_screen()
         self.root.unbind("<Return>")           # Prevent Enter from skipping the game
-        self._last_on_next = None              # message screen callback no longer relevant
         self.connections_puzzles_completed = 0 # reset counter at stage start
 
-        # Start the first puzzle instance (puzzle index is 1-based)
+        # Start the first puzzle (puzzle index is 1-based); the game's widgets persist across puzzles
         puzzle_index = self.connections_puzzles_completed + 1
-        self.conn = ConnectionsGame(
-            parent=self.main_frame,
-            puzzle_index=puzzle_index,
-            on_complete=self.on_connections_puzzle_complete,
-            on_marker=self.send_marker
-        )
+        if self.conn is None:
+            self.conn = ConnectionsGame(
+                parent=self.main_frame,
+                puzzle_index=puzzle_index,
+                on_complete=self.on_connections_puzzle_complete,
+                on_marker=self.send_marker,
+                rng=self.rng
+            )
+            self._screen_cache["connections"] = self.conn.frame
+        else:
+            self.conn.next_puzzle(puzzle_index)
+        self._skip_target = self.on_connections_puzzle_complete
 
     def on_connections_puzzle_complete(self):
         """
@@ -319,6 +555,7 @@ class ExperimentApp:
         Show the 15s REST screen (with spontaneity rating) after EVERY puzzle, including the 10th.
         After the final rest, proceed to RAT instructions.
         """
+        self.conn.cancel_pending()  # '.' may arrive during the success delay
         self.connections_puzzles_completed += 1
         # Launch the rest screen for the puzzle that just finished
         self._start_connections_rest(self.connections_puzzles_completed)
@@ -327,12 +564,13 @@ class ExperimentApp:
         """Begin ERP-style RAT (10s think → reveal → Y/N → 15s rest)."""
         self.clear_screen()
         self.root.unbind("<Return>")
-        self._last_on_next = None
         self.rat = RATGame(
             parent=self.main_frame,
             on_complete=self.show_congratulations,
-            on_marker=self.send_marker
+            on_marker=self.send_marker,
+            on_markers=self.send_markers
         )
+        self._skip_target = self.rat.force_advance
 
     # ---------- Master skip ('.') ----------
     def _master_skip(self, event=None):
@@ -343,33 +581,12 @@ class ExperimentApp:
           - During Connections REST: skip countdown and go to next (rating NoResponse if not chosen).
           - During RAT: delegate to RAT.force_advance().
           - During Post-Questions: skip current question (record NoResponse) and advance.
-        """
-        # If a center_message_screen is active
-        if hasattr(self, "_last_on_next") and self._last_on_next:
-            cb = self._last_on_next
-            self._last_on_next = None
-            cb()
-            return
-
-        # If currently in a Connections REST screen, end it now
-        if self._conn_rest_active:
-            self._end_connections_rest()
-            return
-
-        # If a Connections game exists, move to rest immediately (mimic "puzzle complete")
-        if hasattr(self, "conn") and isinstance(self.conn, ConnectionsGame):
-            self.on_connections_puzzle_complete()
-            return
 
-        # If a RAT game exists, delegate skip logic to it
-        if hasattr(self, "rat") and isinstance(self.rat, RATGame):
-            self.rat.force_advance()
-            return
-
-        # If Post-Questions exist, skip current question as NoResponse
-        if hasattr(self, "postq") and isinstance(self.postq, PostQuestionnaire):
-            self.postq.skip_current()
-            return
+        Each screen installs its handler in self._skip_target when it is shown.
+        """
+        target = self._skip_target
+        if target:
+            target()
 
     # ==================================================================
     # 🔵 CONNECTIONS — 15s REST WITH SPONTANEITY RATING (1..5 BUTTONS)
@@ -396,61 +613,82 @@ class ExperimentApp:
         # Marker: rest start
         self.send_marker(f"Connections{just_finished_index}_Rest_Start")
 
-        # Build REST UI
-        self._conn_rest_frame = tk.Frame(self.main_frame)
-        self._conn_rest_frame.place(relx=0.5, rely=0.5, anchor="center")
+        # Show REST UI (built once; buttons re-enabled and status cleared for this puzzle)
+        frame = self._rest_screen()
+        self._conn_rest_label.config(text=f"Next step in {self._conn_rest_remaining}s")
+        for b in self._conn_rest_buttons:
+            b.state(["!disabled", "!pressed"])
+        self._conn_choice_status.config(text="")
+        frame.place(relx=0.5, rely=0.5, anchor="center")
+
+        # Allow '.' to skip rest (record NoResponse if not selected)
+        self._skip_target = self._end_connections_rest
+
+        # Begin countdown against an absolute deadline (no per-tick drift)
+        self._conn_rest_deadline = time.monotonic() + self._conn_rest_remaining
+        self._tick_connections_rest()
+
+    def _rest_screen(self):
+        """Build the REST frame (title, countdown, 1..5 rating row, status) once; later calls reuse it."""
+        frame = self._screen_cache.get("rest")
+        if frame is not None:
+            return frame
+
+        frame = tk.Frame(self.main_frame)
 
         # Title + countdown
-        tk.Label(self._conn_rest_frame, text="Rest", font=FONT_TITLE).pack(pady=10)
-        self._conn_rest_label = tk.Label(
-            self._conn_rest_frame, text=f"Next step in {self._conn_rest_remaining}s", font=FONT_RAT_TIMER
-        )
+        ttk.Label(frame, text="Rest", style="Title.TLabel").pack(pady=10)
+        self._conn_rest_label = tk.Label(frame, text="", font=FONT_RAT_TIMER_F)
         self._conn_rest_label.pack(pady=5)
 
         # Spontaneity prompt + buttons
         tk.Label(
-            self._conn_rest_frame,
+            frame,
             text="How spontaneous was your answer?\n(1 = very deliberate, 5 = very spontaneous)",
-            font=FONT_RAT_FEEDBACK,
+            font=FONT_RAT_FEEDBACK_F,
             justify="center",
         ).pack(pady=12)
 
-        buttons_row = tk.Frame(self._conn_rest_frame)
+        buttons_row = tk.Frame(frame)
         buttons_row.pack(pady=6)
 
         self._conn_rest_buttons = []
         for val in range(1, 6):
-            b = tk.Button(
+            b = ttk.Button(
                 buttons_row,
                 text=str(val),
-                font=("Arial", 16, "bold"),
+                style="Rating.TButton",
                 width=3,
-                command=lambda v=val: self._conn_select_rating(v),
+                command=partial(self._conn_select_rating, val),
             )
             b.pack(side="left", padx=6)
             self._conn_rest_buttons.append(b)
 
         # Small status line to confirm the selection
-        self._conn_choice_status = tk.Label(self._conn_rest_frame, text="", font=FONT_LABEL)
+        self._conn_choice_status = tk.Label(frame, text="", font=FONT_LABEL_F)
         self._conn_choice_status.pack(pady=6)
 
-        # Allow '.' to skip rest (record NoResponse if not selected)
-        self._last_on_next = self._end_connections_rest
-
-        # Begin countdown
-        self._tick_connections_rest()
+        self._conn_rest_frame = frame
+        self._screen_cache["rest"] = frame
+        return frame
 
     def _tick_connections_rest(self):
-        """Count down once per second; on zero → proceed (record rating or NoResponse)."""
+        """Update the countdown each whole second; at the deadline → proceed (record rating or NoResponse)."""
         if not self._conn_rest_active:
             return
 
-        if self._conn_rest_remaining > 0:
-            self._safe_config(self._conn_rest_label, text=f"Next step in {self._conn_rest_remaining}s")
-            self._conn_rest_remaining -= 1
-            self._conn_rest_after_id = self.root.after(1000, self._tick_connections_rest)
-        else:
+        remaining = self._conn_rest_deadline - time.monotonic()
+        if remaining <= 0:
             self._end_connections_rest()
+            return
+
+        # The rest label is a persistent widget, so a plain existence check is enough here
+        lbl = self._conn_rest_label
+        if lbl is not None and lbl.winfo_exists():
+            lbl.configure(text=f"Next step in {math.ceil(remaining)}s")
+        # Wake at the next whole-second boundary before the deadline
+        next_delay = math.ceil((remaining - math.floor(remaining)) * 1000) or 1000
+        self._conn_rest_after_id = self.root.after(next_delay, self._tick_connections_rest)
 
     def _conn_select_rating(self, value):
         """
@@ -464,16 +702,9 @@ class ExperimentApp:
 
         self._conn_rating_choice = int(value)
 
-        # Disable buttons and highlight the chosen one
+        # Disable buttons and mark the chosen one (Rating.TButton maps disabled+pressed to sunken)
         for i, b in enumerate(self._conn_rest_buttons, start=1):
-            try:
-                if b.winfo_exists():
-                    if i == value:
-                        b.config(state="disabled", relief="sunken")
-                    else:
-                        b.config(state="disabled")
-            except Exception:
-                pass
+            b.state(["disabled", "pressed"] if i == value else ["disabled"])
 
         # Show a confirmation
         self._safe_config(self._conn_choice_status, text=f"Recorded: {value}/5")
@@ -505,31 +736,19 @@ class ExperimentApp:
         # Record rating (append one entry per puzzle)
         self.connections_spontaneity.append(self._conn_rating_choice)
 
-        # Tear down REST UI
+        # Hide REST UI (kept alive for the next puzzle's rest)
         self._conn_rest_active = False
-        try:
-            if self._conn_rest_frame and self._conn_rest_frame.winfo_exists():
-                self._conn_rest_frame.destroy()
-        except Exception:
-            pass
-        self._conn_rest_frame = None
-        self._conn_rest_label = None
-        self._conn_rest_buttons = []
-        self._conn_choice_status = None
+        if self._conn_rest_frame is not None:
+            self._conn_rest_frame.place_forget()
 
         # Marker: rest end
         self.send_marker(f"Connections{self._conn_rest_for_puzzle_index}_Rest_End")
 
         # Decide next step
         if self.connections_puzzles_completed < 15:
-            # Start the next Connections puzzle as a fresh instance
-            puzzle_index = self.connections_puzzles_completed + 1
-            self.conn = ConnectionsGame(
-                parent=self.main_frame,
-                puzzle_index=puzzle_index,
-                on_complete=self.on_connections_puzzle_complete,
-                on_marker=self.send_marker
-            )
+            # Start the next Connections puzzle on the same (persistent) game widgets
+            self.conn.next_puzzle(self.connections_puzzles_completed + 1)
+            self._skip_target = self.on_connections_puzzle_complete
         else:
             # All 10 puzzles done → proceed to RAT instructions
             self.show_rat_instructions()
@@ -543,85 +762,134 @@ class ConnectionsGame:
     Displays a 4x4 grid of word tiles. Participant selects up to 4.
     If the 4 selected tiles share the same 'group' label → success (puzzle ends).
 
+    One instance serves the whole stage: the widgets (including the 16 tile
+    buttons) are built once and re-themed for each puzzle via next_puzzle().
+
     LSL markers:
       PlayerX_Connections#_Start at puzzle show
       PlayerX_Connections#_Guess#_Correct / _Incorrect on each group-of-4 submission
       PlayerX_Connections#_End on success
     """
 
-    def __init__(self, parent, puzzle_index, on_complete, on_marker):
+    def __init__(self, parent, puzzle_index, on_complete, on_marker, rng=None):
         self.parent = parent
         self.on_complete = on_complete
         self.on_marker = on_marker
         self.puzzle_index = puzzle_index
+        self.rng = rng if rng is not None else random.Random()
+
+        # --- UI: labels + grid container + deselect button (all inside self.frame) ---
+        self.frame = tk.Frame(parent)
+        self.frame.pack(expand=True, fill="both")
 
-        # --- UI: labels + grid container + deselect button ---
-        self.selected_label = tk.Label(parent, text="Selected: None", font=FONT_LABEL)
+        self.selected_label = tk.Label(self.frame, text="Selected: None", font=FONT_LABEL_F)
         self.selected_label.pack(pady=5)
 
-        self.status_label = tk.Label(parent, text="", font=FONT_STATUS, fg="black")
+        self.status_label = tk.Label(self.frame, text="", font=FONT_STATUS_F, fg="black")
         self.status_label.pack(pady=5)
 
-        self.grid_frame = tk.Frame(parent)
+        self.grid_frame = tk.Frame(self.frame)
         self.grid_frame.pack(expand=True, fill="both", padx=8, pady=8)
 
-        self.deselect_button = tk.Button(parent, text="❌ Deselect All", font=("Arial", 14), command=self.deselect_all)
+        self.deselect_button = tk.Button(self.frame, text="❌ Deselect All", font=FONT_BUTTON_SM_F, command=self.deselect_all)
         self.deselect_button.pack(pady=5)
 
         # State
-        self.selected = []     # indices of currently selected tiles
+        self._sel_mask = 0     # bit i set ⇔ tile i is selected (all membership checks use this)
+        self._sel_order = []   # selected tile indices in click order (for the label + check)
+        self._btn_state = [None] * 16  # last applied (bg, relief, state) per button
         self.found_groups = 0  # (kept for parity; we end after first success)
         self.guess_count = 0   # count of submitted 4-tile guesses in this puzzle
 
-        # Build the puzzle
+        # Tk after() handles (so a skipped puzzle can't leak callbacks into the next one)
+        self._complete_after_id = None
+        self._flash_after_id = None
+
+        # Build the tile grid once, then the first puzzle
+        self._build_tiles_once()
         self.start_new_puzzle()
 
-    def start_new_puzzle(self):
-        """Pick 4 random groups and lay out 16 tiles (4×4)."""
-        self.selected.clear()
+    def next_puzzle(self, puzzle_index):
+        """Reuse this instance (and its widgets) for the next puzzle of the stage."""
+        self.cancel_pending()
+        self.puzzle_index = puzzle_index
+        self.guess_count = 0
+        self.frame.pack(expand=True, fill="both")
+        self.start_new_puzzle()
+
+    def cancel_pending(self):
+        """Cancel the success flash and the delayed on_complete, if still scheduled."""
+        self._cancel_complete()
+        self._cancel_flash()
 
-        self.groups = random.sample(all_groups, 4)  # choose 4 random groups
-        # Flatten into tile dicts: {"text": word, "group": label, "matched": False}
-        self.tiles = [{"text": m, "group": g["group"], "matched": False}
-                      for g in self.groups for m in g["members"]]
-        random.shuffle(self.tiles)
+    def _cancel_complete(self):
+        """Cancel the pending end-of-puzzle on_complete, if any."""
+        aid = self._complete_after_id
+        if aid:
+            self._complete_after_id = None
+            self.parent.after_cancel(aid)
+
+    def _cancel_flash(self):
+        """Cancel the next pending flash step, if any."""
+        aid = self._flash_after_id
+        if aid:
+            self._flash_after_id = None
+            self.parent.after_cancel(aid)
 
-        self.draw_tiles()
+    def start_new_puzzle(self):
+        """Pick 4 random groups and lay out 16 tiles (4×4)."""
+        self._sel_mask = 0
+        self._sel_order.clear()
+
+        get_all_groups()  # first puzzle pays the JSON parse
+        gids = self.rng.sample(_GROUP_INDICES, 4)  # choose 4 random groups
+        # Tiles carry the label's canonical id, so two sampled groups with the same
+        # label form one pool of interchangeable tiles (any 4 of them are correct)
+        tiles = [(m, _GROUP_CANON[gi]) for gi in gids for m in _GROUP_MEMBERS[gi]]
+        order = list(range(len(tiles)))
+        self.rng.shuffle(order)
+
+        # Parallel per-tile arrays: word, canonical group-label id (into _GROUP_IDS), matched flag
+        self.tile_text = [tiles[i][0] for i in order]
+        self.tile_group = [tiles[i][1] for i in order]
+        self.tile_matched = bytearray(len(tiles))
+
+        self._refresh_tiles()
         self.status_label.config(text="Find a correct group to win!", fg="black")
         self.update_selected_label()
 
         # Marker: puzzle start
         self.on_marker(f"Connections{self.puzzle_index}_Start")
 
-    def draw_tiles(self):
-        """Draw a uniform 4×4 grid. All cells are the same size; buttons fill cells."""
-        # Clear any existing children
-        for w in self.grid_frame.winfo_children():
-            w.destroy()
-
+    def _build_tiles_once(self):
+        """Create a uniform 4×4 grid of buttons. All cells are the same size; buttons fill cells."""
         self.buttons = []
+        self._btn_to_idx = {}  # widget path → tile index, for the shared event handlers
 
-        # Create 16 buttons and place them in a 4×4 grid
-        for i, tile in enumerate(self.tiles):
+        for i in range(16):
+            # Static options (font/wraplength/fg/relief) are set here once; only the
+            # style diff in _set_tile_style touches the button afterwards.
             btn = tk.Button(
                 self.grid_frame,
-                text=tile["text"],
-                font=FONT_TILE,
+                font=FONT_TILE_F,
                 wraplength=160,                          # Wrap long words nicely in the cell
-                bg="white" if not tile["matched"] else "#b3e6b3",
+                fg="black",
+                bg="white",
                 relief="raised",
-                state="disabled" if tile["matched"] else "normal",
+                state="normal",
             )
+            self._btn_state[i] = ("white", "raised", "normal")
 
-            # Bind mousedown for snappy click response
-            btn.bind("<Button-1>", lambda e, idx=i: self.toggle_tile(idx))
-            # Simple hover feedback
-            btn.bind("<Enter>",    lambda e, idx=i: self.on_hover(idx))
-            btn.bind("<Leave>",    lambda e, idx=i: self.on_leave(idx))
+            # Bind mousedown for snappy click response + simple hover feedback.
+            # All tiles share the same three handlers; the tile index comes from event.widget.
+            btn.bind("<Button-1>", self._on_tile_click)
+            btn.bind("<Enter>",    self._on_tile_enter)
+            btn.bind("<Leave>",    self._on_tile_leave)
 
             # Place in grid; sticky makes it fill the entire cell
             btn.grid(row=i // 4, column=i % 4, padx=4, pady=4, sticky="nsew")
             self.buttons.append(btn)
+            self._btn_to_idx[str(btn)] = i
 
         # Make every row/column expand evenly (uniform size boxes)
         for r in range(4):
@@ -629,107 +897,178 @@ class ConnectionsGame:
         for c in range(4):
             self.grid_frame.grid_columnconfigure(c, weight=1, uniform="cols")
 
+    def _on_tile_click(self, event):
+        idx = self._btn_to_idx.get(str(event.widget))
+        if idx is not None:
+            self.toggle_tile(idx)
+
+    def _on_tile_enter(self, event):
+        idx = self._btn_to_idx.get(str(event.widget))
+        if idx is not None:
+            self.on_hover(idx)
+
+    def _on_tile_leave(self, event):
+        idx = self._btn_to_idx.get(str(event.widget))
+        if idx is not None:
+            self.on_leave(idx)
+
+    def _refresh_tiles(self):
+        """Re-theme the existing buttons for the current puzzle's words."""
+        for i, btn in enumerate(self.buttons):
+            btn.configure(text=self.tile_text[i])
+            self._set_tile_style(i, ("white", "raised", "normal"))
+
+    def _set_tile_style(self, i, target):
+        """
+        Apply a (bg, relief, state) style to tile i, passing only what changed.
+        relief is left out unless it differs, so most updates are just bg + state.
+        """
+        prev = self._btn_state[i]
+        if prev == target:
+            return
+        if prev[1] == target[1]:
+            self.buttons[i].configure(bg=target[0], state=target[2])
+        else:
+            self.buttons[i].configure(bg=target[0], relief=target[1], state=target[2])
+        self._btn_state[i] = target
+
     def update_selected_label(self):
         """Show the currently selected words (or 'None' if empty)."""
-        if self.selected:
-            text = ", ".join(self.tiles[i]["text"] for i in self.selected)
+        if self._sel_order:
+            text = ", ".join(self.tile_text[i] for i in self._sel_order)
             self.selected_label.config(text=f"Selected: {text}")
         else:
             self.selected_label.config(text="Selected: None")
 
     def toggle_tile(self, idx):
         """Select or deselect a tile, allowing up to 4 selections, then check."""
-        if self.tiles[idx]["matched"]:
+        if self.tile_matched[idx]:
             return
 
-        if idx in self.selected:
-            self.selected.remove(idx)
-        else:
-            if len(self.selected) < 4:
-                self.selected.append(idx)
+        bit = 1 << idx
+        if self._sel_mask & bit:
+            self._sel_mask ^= bit
+            self._sel_order.remove(idx)
+        elif len(self._sel_order) < 4:
+            self._sel_mask |= bit
+            self._sel_order.append(idx)
 
         self.update_tile_styles()
         self.update_selected_label()
 
-        if len(self.selected) == 4:
+        if len(self._sel_order) == 4:
             self.check_selection()
 
     def deselect_all(self):
         """Clear all selections quickly."""
-        self.selected.clear()
+        self._sel_mask = 0
+        self._sel_order.clear()
         self.update_tile_styles()
         self.update_selected_label()
 
     def update_tile_styles(self):
-        """Visual feedback: matched=green, selected=dark gray, normal=white."""
-        for i, btn in enumerate(self.buttons):
-            if self.tiles[i]["matched"]:
-                btn.config(bg="#b3e6b3", fg="black", relief="raised", state="disabled")
-            elif i in self.selected:
-                btn.config(bg="#666666", fg="black", relief="sunken", state="normal")
+        """
+        Visual feedback: matched=green, selected=dark gray, normal=white.
+        Only buttons whose (bg, relief, state) actually changed are reconfigured.
+        """
+        mask = self._sel_mask
+        for i in range(len(self.buttons)):
+            if self.tile_matched[i]:
+                target = ("#b3e6b3", "raised", "disabled")
+            elif mask & (1 << i):
+                target = ("#666666", "sunken", "normal")
             else:
-                btn.config(bg="white", fg="black", relief="raised", state="normal")
+                target = ("white", "raised", "normal")
+            self._set_tile_style(i, target)
 
     def check_selection(self):
         """If the 4 selected tiles share the same group label → success."""
         # Increment guess counter for this puzzle (a 'guess' == attempting 4 tiles)
         self.guess_count += 1
 
-        groups = [self.tiles[i]["group"] for i in self.selected]
-        is_correct = all(g == groups[0] for g in groups)
+        # Exactly 4 tiles are selected here, so compare them directly (no temp list)
+        sel = self._sel_order
+        group = self.tile_group
+        first = group[sel[0]]
+        is_correct = (group[sel[1]] == first
+                      and group[sel[2]] == first
+                      and group[sel[3]] == first)
 
         if is_correct:
-            group_name = groups[0]
-            for idx in self.selected:
-                self.tiles[idx]["matched"] = True
+            group_name = _GROUP_IDS[first]
+            matched = tuple(sel)
+            for idx in matched:
+                self.tile_matched[idx] = 1
 
             # Marker: guess correct
             self.on_marker(f"Connections{self.puzzle_index}_Guess{self.guess_count}_Correct")
 
             # Show category name on success
             self.status_label.config(text=f"🎉 Correct! Group: {group_name} 🎉", fg="green")
-            self.flash_correct_group(self.selected)
 
             # Marker: puzzle end
             self.on_marker(f"Connections{self.puzzle_index}_End")
 
             # End this puzzle after a brief success display (no separate countdown screen)
-            self.parent.after(2500, self.on_complete)
+            self._complete_after_id = self.parent.after(2500, self._finish_puzzle)
         else:
             # Marker: guess incorrect
             self.on_marker(f"Connections{self.puzzle_index}_Guess{self.guess_count}_Incorrect")
             self.status_label.config(text="Wrong group! Try again.", fg="red")
 
-        self.selected.clear()
+        self._sel_mask = 0
+        self._sel_order.clear()
         self.update_tile_styles()
         self.update_selected_label()
 
-    def flash_correct_group(self, indexes):
-        """Quick yellow flash before settling to green for matched tiles."""
-        for _ in range(2):
-            for idx in indexes:
-                self.buttons[idx].config(bg="yellow")
-            self.parent.update()
-            self.parent.after(150)
-            for idx in indexes:
-                self.buttons[idx].config(bg="#b3e6b3")
-            self.parent.update()
-            self.parent.after(150)
+        if is_correct:
+            # Start the flash only after update_tile_styles(): it paints matched tiles green,
+            # which would overwrite a yellow first step before Tk ever drew it
+            self.flash_correct_group(matched)
+
+    def _finish_puzzle(self):
+        self._complete_after_id = None
+        self.on_complete()
+
+    def flash_correct_group(self, indexes, step=0):
+        """
+        Quick yellow flash before settling to green for matched tiles.
+        Each color step is scheduled with after() so the event loop (and marker
+        delivery) keeps running during the flash.
+        """
+        self._flash_after_id = None
+        colors = ("yellow", "#b3e6b3", "yellow", "#b3e6b3")
+        if step >= len(colors):
+            return
+        # Through _set_tile_style so _btn_state keeps matching what is on screen
+        # (the last step lands on the regular matched style)
+        target = (colors[step], "raised", "disabled")
+        for idx in indexes:
+            self._set_tile_style(idx, target)
+        self._flash_after_id = self.parent.after(150, partial(self.flash_correct_group, indexes, step + 1))
 
     def on_hover(self, idx):
         """Highlight a tile on hover if it is selectable and not already selected."""
-        if not self.tiles[idx]["matched"] and idx not in self.selected:
-            self.buttons[idx].config(bg="#cce6ff")
+        if not self.tile_matched[idx] and not self._sel_mask & (1 << idx):
+            self._set_tile_style(idx, ("#cce6ff", "raised", "normal"))
 
     def on_leave(self, idx):
         """Restore normal color on hover exit if the tile is not selected/matched."""
-        if not self.tiles[idx]["matched"] and idx not in self.selected:
-            self.buttons[idx].config(bg="white")
+        if not self.tile_matched[idx] and not self._sel_mask & (1 << idx):
+            self._set_tile_style(idx, ("white", "raised", "normal"))
 
 
 # ======================================================================
 # 🧪 RAT GAME (ERP: 10s THINK → REVEAL (Y/N) → 15s REST)
 # ======================================================================
+class Phase(IntEnum):
+    """RAT per-item phases; values index RATGame._advance_handlers."""
+    THINK = 0
+    REVEAL = 1
+    REST = 2
+    DONE = 3
+
+
 class RATGame:
     """
     Presents 10 RAT items:
@@ -745,69 +1084,141 @@ class RATGame:
         - In REST → skip countdown and go to next item.
     """
 
-    def __init__(self, parent, on_complete, on_marker):
+    def __init__(self, parent, on_complete, on_marker, on_markers=None):
         self.parent = parent
         self.root = parent.winfo_toplevel()  # bind/unbind at the window level
         self.on_complete = on_complete
         self.on_marker = on_marker
+        self._emit = on_marker  # direct reference used on the marker hot path
+        # Batch emitter for markers sent together (falls back to one on_marker call each)
+        self.on_markers = on_markers or (lambda seq: [on_marker(m) for m in seq])
 
         # Progress & state
         self.index = 0                # which RAT item we’re on (0..9)
-        self.phase = None             # 'think' | 'reveal' | 'rest' | 'done'
+        self.phase = None             # Phase.THINK | REVEAL | REST | DONE (None until the first item starts)
         self.awaiting_yes_no = False  # ensure Y/N only processed once per item
 
+        # Marker labels precomputed per item: self._markers[i]["Start"] == "RAT{i+1}_Start", etc.
+        self._markers = [
+            {k: sys.intern(f"RAT{i + 1}_{k}")
+             for k in ("Start", "End", "Response_Y", "Response_N", "Rest_Start", "Rest_End")}
+            for i in range(len(RAT_PROMPTS))
+        ]
+
         # Timings
         self.think_seconds = 10
         self.rest_seconds_default = 15
 
-        # Tk after() handles (so they can be canceled safely)
+        # Tk after() handles (so they can be canceled safely): one authoritative phase-end
+        # callback per phase. The on-screen countdown is a Tcl-side loop (RAT_COUNTDOWN_TCL)
+        # writing into timer_var, which both timer labels display.
         self._think_after_id = None
         self._rest_after_id  = None
+        self.root.tk.eval(RAT_COUNTDOWN_TCL)
+        self.timer_var = tk.StringVar(self.root)
 
-        # UI members (set per phase; set to None when screen changes)
-        self.think_label  = None
-        self.rest_label   = None
-        self.answer_label = None
-        self.prompt_label = None
+        # '.' skip handler per phase (indexed by Phase)
+        self._advance_handlers = (self._advance_think, self._advance_reveal, self._advance_rest, self._noop)
+
+        # UI members: built once, then shown/hidden and re-texted per phase
+        self._build_widgets()
+
+        # One persistent key handler on the Toplevel; Y/N are honored only while awaiting a reveal answer
+        self._key_handler_id = self.root.bind("<Key>", self._on_key, add="+")
+        self._last_key_ts = 0.0  # time.monotonic() of the last accepted Y/N press (debounce)
 
         # Start first item
         self.start_next_item()
 
     # ---------- Utilities ----------
-    def clear_screen(self):
-        """Destroy all widgets inside this RAT container frame."""
-        for w in self.parent.winfo_children():
-            w.destroy()
+    def _build_widgets(self):
+        """
+        Create the phase containers and every label once (all hidden initially).
+        Containers are positioned with place() (THINK/REVEAL top-anchored, REST centered);
+        phases toggle place()/place_forget().
+        """
+        # THINK (REVEAL keeps this on screen and shows reveal_extra_frame beneath the instruction)
+        self.think_frame = tk.Frame(self.parent)
+        self.header_lbl = tk.Label(self.think_frame, font=FONT_RAT_TIMER_F)
+        self.header_lbl.pack(pady=10)
+        self.prompt_lbl = tk.Label(self.think_frame, font=FONT_RAT_PROMPT_F, wraplength=800, justify="center")
+        self.prompt_lbl.pack(pady=20)
+        self.timer_lbl  = tk.Label(self.think_frame, font=FONT_RAT_TIMER_F, textvariable=self.timer_var)
+        self.timer_lbl.pack(pady=5)
+        self.instr_lbl  = tk.Label(self.think_frame,
+                                   text="Think of a single word that relates to all three. No typing yet.",
+                                   font=FONT_RAT_FEEDBACK_F)
+        self.instr_lbl.pack(pady=10)
+
+        # REVEAL: answer + Y/N prompt, packed into think_frame only during REVEAL
+        self.reveal_extra_frame = tk.Frame(self.think_frame)
+        self.answer_lbl = tk.Label(self.reveal_extra_frame, font=FONT_RAT_ANSWER_F)
+        self.answer_lbl.pack(pady=15)
+        self.yes_no_lbl = tk.Label(self.reveal_extra_frame,
+                                   text="Did you already know this answer before it was revealed?\nPress Y for Yes, N for No.",
+                                   font=FONT_RAT_FEEDBACK_F)
+        self.yes_no_lbl.pack(pady=10)
+
+        # REST
+        self.rest_frame = tk.Frame(self.parent)
+        self.rest_title = tk.Label(self.rest_frame, text="Rest", font=FONT_TITLE_F)
+        self.rest_title.pack(pady=10)
+        self.rest_timer = tk.Label(self.rest_frame, font=FONT_RAT_TIMER_F, textvariable=self.timer_var)
+        self.rest_timer.pack(pady=5)
+
+    def _hide_all(self):
+        """Hide every phase container (nothing is destroyed)."""
+        self.think_frame.place_forget()
+        self.reveal_extra_frame.pack_forget()
+        self.rest_frame.place_forget()
+
+    def _cancel_think(self):
+        """Cancel the pending think-phase reveal, if any."""
+        aid = self._think_after_id
+        if aid:
+            self._think_after_id = None
+            self.root.after_cancel(aid)
 
-    def _cancel_after(self, attr_name):
-        """Cancel a pending Tk after() callback by attribute name if present."""
-        aid = getattr(self, attr_name, None)
+    def _cancel_rest(self):
+        """Cancel the pending end-of-rest callback, if any."""
+        aid = self._rest_after_id
         if aid:
-            try:
-                self.root.after_cancel(aid)
-            except Exception:
-                pass
-            setattr(self, attr_name, None)
+            self._rest_after_id = None
+            self.root.after_cancel(aid)
 
-    def _safe_config(self, widget, **kwargs):
-        """Safely config() only if widget still exists."""
-        if widget is None:
-            return
-        try:
-            if widget.winfo_exists():
-                widget.config(**kwargs)
-        except Exception:
-            pass
+    def _cancel_label_tick(self):
+        """Stop the Tcl-side countdown display loop, if running."""
+        self.root.tk.call("rat_countdown_cancel")
+
+    def _weak_after(self, ms, method_name):
+        """
+        Schedule self.<method_name>() via after() without Tk holding a strong reference
+        to this instance; a late callback after the game is gone becomes a no-op.
+        """
+        ref = weakref.ref(self)
+
+        def trampoline():
+            obj = ref()
+            if obj is not None:
+                getattr(obj, method_name)()
+
+        return self.root.after(ms, trampoline)
+
+    def _start_countdown(self, fmt, seconds):
+        """Show `fmt` % whole-seconds-left in timer_var, counting down from `seconds` (Tcl-side loop)."""
+        self.root.tk.call("rat_countdown_start", str(self.timer_var), fmt, seconds)
 
     # ---------- Flow control ----------
     def start_next_item(self):
         """Advance to the next RAT item or end if done."""
-        # Cancel any pending timers from previous item (paranoia cleanup)
-        self._cancel_after("_think_after_id")
-        self._cancel_after("_rest_after_id")
+        # Canonical cancel point between items (the phase methods below don't re-cancel)
+        self._cancel_think()
+        self._cancel_rest()
+        self._cancel_label_tick()
 
         if self.index >= len(RAT_PROMPTS):
-            self.phase = "done"
+            self.phase = Phase.DONE
+            self.destroy()
             self.on_complete()
             return
 
@@ -816,173 +1227,138 @@ class RATGame:
     # ---------- THINK PHASE ----------
     def show_think_phase(self):
         """Show the 3-word prompt and a 10s countdown."""
-        # Clean up any reveal/rest binds/timers from previous item
-        self._cancel_after("_think_after_id")
-        self._cancel_after("_rest_after_id")
-        self._unbind_yes_no_keys()
-
-        self.clear_screen()
-        self.phase = "think"
+        # start_next_item already canceled everything; the countdown start replaces any display loop
+        assert self._think_after_id is None and self._rest_after_id is None
+        self._hide_all()
+        self.phase = Phase.THINK
         self.awaiting_yes_no = False
 
-        # Header: progress
-        tk.Label(self.parent,
-                 text=f"RAT Item {self.index + 1} of {len(RAT_PROMPTS)}",
-                 font=FONT_RAT_TIMER).pack(pady=10)
-
-        # Prompt: three words
-        tk.Label(self.parent,
-                 text=RAT_PROMPTS[self.index],
-                 font=FONT_RAT_PROMPT,
-                 wraplength=800,
-                 justify="center").pack(pady=20)
-
-        # Timer label
-        self._think_remaining = self.think_seconds
-        self.think_label = tk.Label(self.parent, text=f"Thinking: {self._think_remaining}s", font=FONT_RAT_TIMER)
-        self.think_label.pack(pady=5)
-
-        # Instruction
-        tk.Label(self.parent,
-                 text="Think of a single word that relates to all three. No typing yet.",
-                 font=FONT_RAT_FEEDBACK).pack(pady=10)
+        # Header: progress / prompt: three words / timer / instruction
+        self.header_lbl.config(text=RAT_ITEM_HEADERS[self.index])
+        self.prompt_lbl.config(text=RAT_PROMPTS[self.index])
+        # Top-anchored (not centered): packing the reveal block must grow the container
+        # downward only, so nothing already on screen moves at the Reveal marker
+        self.think_frame.place(relx=0.5, rely=0.15, anchor="n")
 
         # Marker: RAT trial start
-        self.on_marker(f"RAT{self.index + 1}_Start")
+        self._emit(self._markers[self.index]["Start"])
 
-        # Start countdown
-        self._tick_think()
-
-    def _tick_think(self):
-        """Count down once per second; on zero → reveal."""
-        if self.phase != "think":
-            return  # Phase changed (skip/advance/interrupt)
-
-        if self._think_remaining > 0:
-            self._safe_config(self.think_label, text=f"Thinking: {self._think_remaining}s")
-            self._think_remaining -= 1
-            self._think_after_id = self.root.after(1000, self._tick_think)
-        else:
-            self.reveal_phase()
+        # Start countdown: one callback at the deadline, plus the label refresh loop
+        self._think_after_id = self._weak_after(self.think_seconds * 1000, "reveal_phase")
+        self._start_countdown("Thinking: %ds", self.think_seconds)
 
     # ---------- REVEAL PHASE ----------
     def reveal_phase(self):
         """Reveal the correct answer and capture a Y/N judgment from the participant."""
-        # Cancel any residual THINK timer
-        self._cancel_after("_think_after_id")
+        # THINK → REVEAL transition point for both the deadline callback and '.' (_advance_think):
+        # drop the deadline (a no-op once it has fired) and freeze the countdown display so
+        # nothing on screen changes after the answer appears
+        self._cancel_think()
+        self._cancel_label_tick()
 
         # If we already moved on, don't double-render
-        if self.phase == "rest" or self.phase == "done":
+        if self.phase == Phase.REST or self.phase == Phase.DONE:
             return
 
-        self.phase = "reveal"
+        self.phase = Phase.REVEAL
         self.awaiting_yes_no = True
 
         # Keep existing prompt on screen; append the answer + instructions
-        self.answer_label = tk.Label(
-            self.parent,
-            text=f"Answer: {RAT_ANSWERS[self.index].upper()}",
-            font=FONT_RAT_ANSWER
-        )
-        self.answer_label.pack(pady=15)
-
-        self.prompt_label = tk.Label(
-            self.parent,
-            text="Did you already know this answer before it was revealed?\nPress Y for Yes, N for No.",
-            font=FONT_RAT_FEEDBACK
-        )
-        self.prompt_label.pack(pady=10)
-
-        # Bind to TOP-LEVEL so keypresses are captured reliably regardless of focus
-        self._bind_yes_no_keys()
-
-    def _bind_yes_no_keys(self):
-        """Bind Y/N globally to the Toplevel so a focused widget is not required."""
-        try:
-            self.root.bind_all("<KeyPress-y>", self._on_yes)
-            self.root.bind_all("<KeyPress-Y>", self._on_yes)
-            self.root.bind_all("<KeyPress-n>", self._on_no)
-            self.root.bind_all("<KeyPress-N>", self._on_no)
-        except Exception:
-            pass
+        self.answer_lbl.config(text=RAT_REVEAL_TEXT[self.index])
+        self.reveal_extra_frame.pack()
+
+    def _on_key(self, event):
+        """Toplevel <Key> handler: route Y/N to _on_yes/_on_no during REVEAL, ignore everything else."""
+        key = event.keysym.lower()
+        if key not in ("y", "n"):
+            return  # other keys (e.g. Shift before Y) must not reset the debounce window
+
+        # Debounce OS key-repeat: drop Y/N presses within 50 ms of the last one
+        now = time.monotonic()
+        if now - self._last_key_ts < 0.05:
+            return
+        self._last_key_ts = now
 
-    def _unbind_yes_no_keys(self):
-        """Remove the global Y/N bindings (safe to call multiple times)."""
-        try:
-            self.root.unbind_all("<KeyPress-y>")
-            self.root.unbind_all("<KeyPress-Y>")
-            self.root.unbind_all("<KeyPress-n>")
-            self.root.unbind_all("<KeyPress-N>")
-        except Exception:
-            pass
+        if not (self.phase == Phase.REVEAL and self.awaiting_yes_no):
+            return
+        if key == "y":
+            self._on_yes(event)
+        elif key == "n":
+            self._on_no(event)
 
     def _on_yes(self, event=None):
         """User indicated they knew the answer before reveal (Y)."""
-        if not (self.phase == "reveal" and self.awaiting_yes_no):
+        if not (self.phase == Phase.REVEAL and self.awaiting_yes_no):
             return
         self.awaiting_yes_no = False
-        self._unbind_yes_no_keys()
 
         # Marker: response + trial end
-        self.on_marker(f"RAT{self.index + 1}_Response_Y")
-        self.on_marker(f"RAT{self.index + 1}_End")
+        markers = self._markers[self.index]
+        self.on_markers((markers["Response_Y"], markers["End"]))
 
         self.start_rest_phase()
 
     def _on_no(self, event=None):
         """User indicated they did not know the answer before reveal (N)."""
-        if not (self.phase == "reveal" and self.awaiting_yes_no):
+        if not (self.phase == Phase.REVEAL and self.awaiting_yes_no):
             return
         self.awaiting_yes_no = False
-        self._unbind_yes_no_keys()
 
         # Marker: response + trial end
-        self.on_marker(f"RAT{self.index + 1}_Response_N")
-        self.on_marker(f"RAT{self.index + 1}_End")
+        markers = self._markers[self.index]
+        self.on_markers((markers["Response_N"], markers["End"]))
 
         self.start_rest_phase()
 
     # ---------- REST PHASE ----------
     def start_rest_phase(self):
         """Show a 15s rest countdown, then advance to the next item."""
-        # Always unbind Y/N and cancel any running think timer
-        self._unbind_yes_no_keys()
-        self._cancel_after("_think_after_id")
+        # Only reachable from REVEAL, by which point the THINK timer has fired or been canceled
+        assert self._think_after_id is None
 
-        # Clear reveal UI
-        self.clear_screen()
-        self.phase = "rest"
+        # Hide reveal UI; show the centered rest panel
+        self._hide_all()
+        self.phase = Phase.REST
 
-        rest_frame = tk.Frame(self.parent)
-        rest_frame.place(relx=0.5, rely=0.5, anchor="center")
-
-        tk.Label(rest_frame, text="Rest", font=FONT_TITLE).pack(pady=10)
-        self._rest_remaining = self.rest_seconds_default
-        self.rest_label = tk.Label(rest_frame, text=f"Next item in {self._rest_remaining}s", font=FONT_RAT_TIMER)
-        self.rest_label.pack(pady=5)
+        self.rest_frame.place(relx=0.5, rely=0.5, anchor="center")
 
         # Marker: RAT rest start
-        self.on_marker(f"RAT{self.index + 1}_Rest_Start")
+        self._emit(self._markers[self.index]["Rest_Start"])
 
-        self._tick_rest()
+        self._rest_after_id = self._weak_after(self.rest_seconds_default * 1000, "_end_rest_phase")
+        self._start_countdown("Next item in %ds", self.rest_seconds_default)
 
-    def _tick_rest(self):
-        """Count down once per second; on zero → next item."""
-        if self.phase != "rest":
+    def _end_rest_phase(self):
+        """REST deadline reached (or skipped) → emit Rest_End and advance to the next item."""
+        if self.phase != Phase.REST:
             return  # Phase changed (skip/advance)
+        # REST → next item transition point for both the deadline callback and '.' (_advance_rest)
+        self._cancel_rest()
 
-        if self._rest_remaining > 0:
-            self._safe_config(self.rest_label, text=f"Next item in {self._rest_remaining}s")
-            self._rest_remaining -= 1
-            self._rest_after_id = self.root.after(1000, self._tick_rest)
-        else:
-            # Marker: RAT rest end
-            self._cancel_after("_rest_after_id")
-            self.on_marker(f"RAT{self.index + 1}_Rest_End")
+        # Marker: RAT rest end
+        self._emit(self._markers[self.index]["Rest_End"])
 
-            # Advance to next item
-            self.index += 1
-            self.start_next_item()
+        # Advance to next item
+        self.index += 1
+        self.start_next_item()
+
+    def destroy(self):
+        """
+        Release everything Tk holds on our behalf (called once the RAT stage is finished):
+        pending after() handles, the Toplevel key handler, and the label references.
+        """
+        self._cancel_think()
+        self._cancel_rest()
+        self._cancel_label_tick()
+
+        if self._key_handler_id is not None:
+            self.root.unbind("<Key>", self._key_handler_id)
+            self._key_handler_id = None
+
+        self.header_lbl = self.prompt_lbl = self.timer_lbl = self.instr_lbl = None
+        self.answer_lbl = self.yes_no_lbl = None
+        self.think_frame = self.reveal_extra_frame = None
+        self.rest_frame = self.rest_title = self.rest_timer = None
 
     # ---------- Master skip integration ----------
     def force_advance(self):
@@ -992,20 +1368,22 @@ class RATGame:
           - REVEAL → treat as 'No' (once) and start rest
           - REST → cancel countdown and go to next item
         """
-        if self.phase == "think":
-            self._cancel_after("_think_after_id")
-            self.reveal_phase()
-        elif self.phase == "reveal":
-            if self.awaiting_yes_no:
-                self._on_no()
-        elif self.phase == "rest":
-            self._cancel_after("_rest_after_id")
-            # Close rest immediately (emit rest end marker)
-            self.on_marker(f"RAT{self.index + 1}_Rest_End")
-            self.index += 1
-            self.start_next_item()
-        elif self.phase == "done":
-            pass  # nothing to do
+        if self.phase is not None:
+            self._advance_handlers[self.phase]()
+
+    def _advance_think(self):
+        self.reveal_phase()  # reveal_phase cancels the THINK timers itself
+
+    def _advance_reveal(self):
+        if self.awaiting_yes_no:
+            self._on_no()
+
+    def _advance_rest(self):
+        # Close rest immediately (emit rest end marker; _end_rest_phase cancels the deadline)
+        self._end_rest_phase()
+
+    def _noop(self):
+        pass  # DONE: nothing to do
 
 
 # ======================================================================
@@ -1041,75 +1419,89 @@ class PostQuestionnaire:
             "I am good at dealing with novel and unexpected situations",
             "It isn’t hard to think of specific examples to illustrate my point",
         ]
+        self._n = len(self.questions)  # fixed for the survey's lifetime
         self.index = 0  # 0..11
+        self._headers = tuple(f"Question {q + 1} of {self._n}" for q in range(self._n))
+
+        # Marker labels per question: self._post_markers[q][0] is "PostQ{q+1}_NoResponse",
+        # self._post_markers[q][v] is "PostQ{q+1}_{v}" for ratings v = 1..10
+        self._post_markers = [
+            tuple(sys.intern(f"PostQ{q + 1}_NoResponse" if v == 0 else f"PostQ{q + 1}_{v}") for v in range(11))
+            for q in range(self._n)
+        ]
 
         self.frame = tk.Frame(self.parent)
         self.frame.pack(expand=True, fill="both")
 
-        self.show_current()
-
-    def clear(self):
-        for w in self.frame.winfo_children():
-            w.destroy()
-
-    def show_current(self):
-        self.clear()
-        if self.index >= len(self.questions):
-            # Done
-            self.on_complete()
-            return
+        # One set of widgets serves every question; moving on only changes the label text
+        self.qnum_lbl = tk.Label(self.frame, font=FONT_RAT_TIMER_F)
+        self.qnum_lbl.pack(pady=10)
 
-        # Hook '.' to skip this question (records NoResponse)
-        self.app._last_on_next = self.skip_current
-
-        qnum = self.index + 1
-        tk.Label(
-            self.frame,
-            text=f"Question {qnum} of {len(self.questions)}",
-            font=FONT_RAT_TIMER
-        ).pack(pady=10)
-
-        tk.Label(
-            self.frame,
-            text=self.questions[self.index],
-            font=FONT_RAT_PROMPT,
-            wraplength=800,
-            justify="center"
-        ).pack(pady=20)
+        self.qtext_lbl = tk.Label(self.frame, font=FONT_RAT_PROMPT_F, wraplength=800, justify="center")
+        self.qtext_lbl.pack(pady=20)
 
-        tk.Label(
+        self.instr_lbl = tk.Label(
             self.frame,
             text="Please rate from 1 (Not at all like me) to 10 (Very much like me).",
-            font=FONT_RAT_FEEDBACK
-        ).pack(pady=10)
+            font=FONT_RAT_FEEDBACK_F
+        )
+        self.instr_lbl.pack(pady=10)
 
         row = tk.Frame(self.frame)
         row.pack(pady=6)
 
-        # Create rating buttons 1–10
+        # Rating buttons 1–10 (created once; command bound once per button)
+        self.rating_buttons = []
         for val in range(1, 11):
-            tk.Button(
+            b = tk.Button(
                 row,
                 text=str(val),
-                font=("Arial", 16, "bold"),
+                font=FONT_BUTTON_BOLD_F,
                 width=3,
-                command=lambda v=val: self.record_response(v)
-            ).pack(side="left", padx=4, pady=4)
+                command=partial(self._on_rate, val)
+            )
+            b.pack(side="left", padx=4, pady=4)
+            self.rating_buttons.append(b)
+
+        # Hook '.' to skip the current question (records NoResponse); registered once for the
+        # whole survey and released in _finish()
+        self.app._skip_target = self.skip_current
+
+        self.show_current()
+
+    def show_current(self):
+        """Render question `index` (callers handle the end-of-survey check)."""
+        self.qnum_lbl.config(text=self._headers[self.index])
+        self.qtext_lbl.config(text=self.questions[self.index])
+
+    def _on_rate(self, value):
+        """Rating button handler (ignores late clicks once the survey is finished)."""
+        if self.index < self._n:
+            self.record_response(value)
 
     def record_response(self, value):
-        qnum = self.index + 1
-        self.send_marker(f"PostQ{qnum}_{value}")
+        self.send_marker(self._post_markers[self.index][value])
         self.index += 1
+        if self.index >= self._n:
+            self._finish()
+            return
         self.show_current()
 
     def skip_current(self):
         """Record NoResponse for current question and advance (used by '.' master skip)."""
-        if self.index < len(self.questions):
-            qnum = self.index + 1
-            self.send_marker(f"PostQ{qnum}_NoResponse")
+        if self.index < self._n:
+            self.send_marker(self._post_markers[self.index][0])
             self.index += 1
+            if self.index >= self._n:
+                self._finish()
+                return
             self.show_current()
 
+    def _finish(self):
+        """Release the '.' hook before handing off, so the next screen can install its own."""
+        self.app._skip_target = None
+        self.on_complete()
+
 
 
 # ======================================================================